@@ -3,12 +3,18 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date as Date
 from decimal import Decimal, ROUND_HALF_EVEN, getcontext
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 
 # Configure a sane decimal precision for monetary calculations
 getcontext().prec = 28
 
+# Shared Decimal constants, built once so hot paths skip string parsing
+_Q_CENTS = Decimal("0.01")
+_TAX_RATE = Decimal("0.01")
+_HUNDRED = Decimal("100")
+
 
 @dataclass(frozen=True)
 class CalculationInput:
@@ -45,21 +51,48 @@ class CalculationResult:
     final_amount: Decimal
 
 
+def _div_round_half_even(num: int, den: int) -> int:
+    """Divide num by den (den > 0) rounding to the nearest integer HALF_EVEN.
+
+    Pure integer arithmetic; matches Decimal quantization with ROUND_HALF_EVEN.
+    """
+    q, r = divmod(num, den)
+    if r * 2 < den:
+        return q
+    if r * 2 > den:
+        return q + 1
+    # Exactly halfway: round to the even quotient
+    return q + (q & 1)
+
+
 def _round_waste_to_nearest_integer_half_even(nuts: int) -> int:
     """Compute 2.2% waste and round to nearest integer using banker's rounding.
 
     The spec requests waste_raw = total * 0.022 then round() (Python default is
-    banker's rounding). We implement using Decimal with HALF_EVEN to match.
+    banker's rounding). Since 0.022 is exactly 22/1000, this is done with pure
+    integer arithmetic: divide nuts*22 by 1000 and round the quotient HALF_EVEN.
     """
-    waste_raw = (Decimal(nuts) * Decimal("0.022"))
-    # Quantize to integer with HALF_EVEN
-    waste_quantized = waste_raw.quantize(Decimal("1"), rounding=ROUND_HALF_EVEN)
-    return int(waste_quantized)
+    return _div_round_half_even(nuts * 22, 1000)
+
+
+@lru_cache(maxsize=16)
+def _labor_ratio(percent: Decimal) -> Tuple[int, int]:
+    """Exact integer (numerator, denominator) for a labor percent.
+
+    Memoized: the percent is stable across slips (default 11), so the
+    conversion runs once per distinct value rather than per calculation.
+    """
+    return percent.as_integer_ratio()
+
+
+def _decimal_from_paise(paise: int) -> Decimal:
+    """Build a two-decimal-place Decimal from an integer amount in paise."""
+    return Decimal(paise).scaleb(-2)
 
 
 def _quantize_money(value: Decimal) -> Decimal:
     """Quantize to two decimal places using HALF_EVEN."""
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN)
+    return value.quantize(_Q_CENTS, rounding=ROUND_HALF_EVEN)
 
 
 def calculate(input_data: CalculationInput) -> CalculationResult:
@@ -90,19 +123,31 @@ def calculate(input_data: CalculationInput) -> CalculationResult:
     waste_nuts = _round_waste_to_nearest_integer_half_even(input_data.total_nuts)
     remaining_nuts = input_data.total_nuts - waste_nuts
 
-    # Monetary math
-    gross_amount = Decimal(remaining_nuts) * input_data.price_each_rupees
-    tax_amount = gross_amount * Decimal("0.01")
-    labor_charges = Decimal(input_data.total_nuts) * (input_data.labor_percent / Decimal("100"))
-
-    # Final
-    final_amount = gross_amount - tax_amount - labor_charges
+    # Monetary math in integer paise. Price and labor percent are exact
+    # fractions (Decimal.as_integer_ratio), so no Decimal arithmetic runs on
+    # this path and each rounded value matches HALF_EVEN quantization to cents:
+    # - gross = remaining * price            -> remaining*pn/pd rupees
+    # - tax   = gross * 1%                   -> remaining*pn/(100*pd) rupees
+    # - labor = total * percent/100          -> total*ln/(100*ld) rupees
+    # - final = gross - tax - labor, rounded from the exact (unrounded)
+    #   components, matching the previous quantize-at-the-end behaviour.
+    price_num, price_den = input_data.price_each_rupees.as_integer_ratio()
+    labor_num, labor_den = _labor_ratio(input_data.labor_percent)
+    total_nuts = input_data.total_nuts
+
+    gross_paise = _div_round_half_even(remaining_nuts * price_num * 100, price_den)
+    tax_paise = _div_round_half_even(remaining_nuts * price_num, price_den)
+    labor_paise = _div_round_half_even(total_nuts * labor_num, labor_den)
+    final_paise = _div_round_half_even(
+        99 * remaining_nuts * price_num * labor_den - total_nuts * labor_num * price_den,
+        price_den * labor_den,
+    )
 
-    # Quantize monetary outputs to 2 decimals for storage/presentation
-    gross_amount = _quantize_money(gross_amount)
-    tax_amount = _quantize_money(tax_amount)
-    labor_charges = _quantize_money(labor_charges)
-    final_amount = _quantize_money(final_amount)
+    # Convert to Decimal once at the end for storage/presentation
+    gross_amount = _decimal_from_paise(gross_paise)
+    tax_amount = _decimal_from_paise(tax_paise)
+    labor_charges = _decimal_from_paise(labor_paise)
+    final_amount = _decimal_from_paise(final_paise)
 
     return CalculationResult(
         invoice_no=input_data.invoice_no,
@@ -122,8 +167,16 @@ def calculate(input_data: CalculationInput) -> CalculationResult:
 
 
 def format_currency(value: Decimal) -> str:
-    """Format currency with western thousands separators and 2 decimals."""
-    return f"{value:,.2f}"
+    """Format currency with western thousands separators and 2 decimals.
+
+    Formatting goes through integer paise: int formatting with ',' is a C
+    fast path, unlike Decimal.__format__ which is implemented in Python.
+    Values with more than 2 decimals round HALF_EVEN, as f"{value:,.2f}" did.
+    """
+    paise = int(value.scaleb(2).to_integral_value(rounding=ROUND_HALF_EVEN))
+    sign = "-" if paise < 0 else ""
+    whole, frac = divmod(abs(paise), 100)
+    return f"{sign}{whole:,}.{frac:02d}"
 
 
 def format_date_for_slip(date_value: Date) -> str:
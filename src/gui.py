@@ -1,21 +1,40 @@
 from __future__ import annotations
 
+import re
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date as Date
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import Dict, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Optional
 
 from .core import CalculationInput, calculate, format_currency, format_date_for_slip
-from .persistence import ensure_files_exist, load_clients, append_history, save_slip_text
+from .persistence import _clients_files_key, ensure_files_exist, load_clients, append_history, save_slip_text
 from .cli import render_slip, APP_TITLE  # reuse slip layout
 
 
-def parse_date(value: Optional[str]) -> Date:
-    if not value:
-        return Date.today()
-    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d-%b-%Y", "%d/%m/%Y"):
+# Matches DD-MM-YYYY and DD/MM/YYYY (single-digit day/month allowed)
+_DMY_RE = re.compile(r"(\d{1,2})[-/](\d{1,2})[-/](\d{4})")
+
+
+@lru_cache(maxsize=256)
+def _parse_date_cached(value: str) -> Date:
+    # Fast path: ISO YYYY-MM-DD via the C-implemented parser
+    try:
+        return Date.fromisoformat(value)
+    except ValueError:
+        pass
+    # DD-MM-YYYY / DD/MM/YYYY via one precompiled regex, no strptime
+    m = _DMY_RE.fullmatch(value)
+    if m:
+        try:
+            return Date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        except ValueError:
+            pass
+    # Rare forms (abbreviated month, single-digit ISO) fall back to strptime
+    for fmt in ("%Y-%m-%d", "%d-%b-%Y"):
         try:
             return datetime.strptime(value, fmt).date()
         except ValueError:
@@ -23,6 +42,13 @@ def parse_date(value: Optional[str]) -> Date:
     raise ValueError("Invalid date. Use YYYY-MM-DD or DD-MM-YYYY (or DD-MMM-YYYY).")
 
 
+def parse_date(value: Optional[str]) -> Date:
+    # Resolve the empty/None case outside the cache so "today" stays current
+    if not value:
+        return Date.today()
+    return _parse_date_cached(value)
+
+
 class App(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -31,9 +57,32 @@ class App(tk.Tk):
 
         ensure_files_exist()
         self.client_map: Dict[int, str] = load_clients()
+        self._client_items: List[str] = []
+        self._clients_key = _clients_files_key()
+        self._rebuild_client_items()
 
         self._build_ui()
 
+    def _rebuild_client_items(self) -> None:
+        # Sort on the client number alone (C-level key) instead of comparing
+        # whole (no, name) tuples
+        items = sorted(self.client_map.items(), key=itemgetter(0))
+        self._client_items = [f"{no} - {name}" for no, name in items]
+
+    def refresh_clients(self) -> None:
+        """Re-read the clients files and rebuild the combo, only if one changed."""
+        # Keyed on both clients.json and clients.csv mtimes, same as the
+        # load_clients() cache - either file may be the backing store
+        key = _clients_files_key()
+        if key == self._clients_key:
+            return
+        self._clients_key = key
+        self.client_map = load_clients()
+        self._rebuild_client_items()
+        self.client_combo["values"] = self._client_items
+        if self._client_items:
+            self.client_combo.current(0)
+
     def _build_ui(self) -> None:
         pad = {"padx": 8, "pady": 6}
 
@@ -52,7 +101,7 @@ class App(tk.Tk):
         # Client selection (Combobox with "no - name")
         ttk.Label(form, text="Client").grid(row=1, column=0, sticky="w", **pad)
         self.client_var = tk.StringVar()
-        items = [f"{no} - {name}" for no, name in sorted(self.client_map.items())]
+        items = self._client_items
         self.client_combo = ttk.Combobox(form, textvariable=self.client_var, values=items, width=28, state="readonly")
         if items:
             self.client_combo.current(0)
@@ -80,6 +129,8 @@ class App(tk.Tk):
         self.action_btn.grid(row=0, column=0, sticky="ew", **pad)
         self.save_btn = ttk.Button(btns, text="Save Slip", command=self.on_save)
         self.save_btn.grid(row=0, column=1, sticky="ew", **pad)
+        self.refresh_btn = ttk.Button(btns, text="Refresh Clients", command=self.refresh_clients)
+        self.refresh_btn.grid(row=0, column=2, sticky="ew", **pad)
 
         # Right slip preview
         preview = ttk.Frame(container)
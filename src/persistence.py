@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import atexit
 import csv
+from collections import namedtuple
 from dataclasses import asdict
 from datetime import datetime, date as Date
+from functools import lru_cache
 import json
+import os
+import re
+import tempfile
+import threading
+import time
 from decimal import Decimal
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple, Optional
@@ -19,9 +27,41 @@ SLIPS_DIR = DATA_DIR / "slips"
 RANGE_DIR = DATA_DIR / "range_reports"
 PARTIES_CSV = DATA_DIR / "parties.csv"
 
+HISTORY_FIELDS = [
+    "date",
+    "v_no",
+    "client_no",
+    "client_name",
+    "total_nuts",
+    "waste",
+    "remaining",
+    "price_each",
+    "gross",
+    "tax",
+    "labor",
+    "final_amount",
+    "created_at",
+    "party_name",
+]
+
+# Precompiled row template for history appends. v_no, client_name and
+# party_name are free text, so those are quoted (with '"' doubled).
+_HISTORY_ROW_FMT = (
+    '{date},"{v_no}",{client_no},"{client_name}",{total_nuts},{waste},{remaining},'
+    '{price_each},{gross},{tax},{labor},{final_amount},{created_at},"{party_name}"\n'
+)
+
+
+# Process-wide guards so the existence/migration checks run once, not per call
+_files_ensured = False
+_party_column_ok = False
+
 
 def ensure_files_exist() -> None:
-    """Create CSV files with headers if they don't exist."""
+    """Create CSV files with headers if they don't exist (once per process)."""
+    global _files_ensured
+    if _files_ensured:
+        return
     # Ensure slips directory
     SLIPS_DIR.mkdir(parents=True, exist_ok=True)
     # Ensure range reports directory
@@ -41,30 +81,41 @@ def ensure_files_exist() -> None:
         PARTIES_CSV.write_text("party_name\n", encoding="utf-8")
 
     if not HISTORY_CSV.exists():
-        headers = [
-            "date",
-            "v_no",
-            "client_no",
-            "client_name",
-            "total_nuts",
-            "waste",
-            "remaining",
-            "price_each",
-            "gross",
-            "tax",
-            "labor",
-            "final_amount",
-            "created_at",
-            "party_name",
-        ]
         with HISTORY_CSV.open("w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
-            writer.writerow(headers)
+            writer.writerow(HISTORY_FIELDS)
+
+    _files_ensured = True
+
+
+# Clients cache keyed on source-file mtimes; re-parsed only when a file changes
+_clients_cache: Optional[Dict[int, str]] = None
+_clients_cache_key: Tuple[float, float] = (0.0, 0.0)
+
+
+def _clients_files_key() -> Tuple[float, float]:
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    return (mtime(CLIENTS_JSON), mtime(CLIENTS_CSV))
+
+
+def invalidate_clients_cache() -> None:
+    """Drop the cached clients map (mainly for tests)."""
+    global _clients_cache
+    _clients_cache = None
 
 
 def load_clients() -> Dict[int, str]:
     """Load client number to name map from clients.csv."""
+    global _clients_cache, _clients_cache_key
     ensure_files_exist()
+    key = _clients_files_key()
+    if _clients_cache is not None and key == _clients_cache_key:
+        return _clients_cache
     mapping: Dict[int, str] = {}
     if CLIENTS_JSON.exists():
         try:
@@ -92,20 +143,46 @@ def load_clients() -> Dict[int, str]:
                 name = (row.get("client_name") or "").strip()
                 if no > 0 and name:
                     mapping[no] = name
+    _clients_cache = mapping
+    _clients_cache_key = key
     return mapping
 
 
+ClientMaps = namedtuple("ClientMaps", "by_no by_name")
+
+_client_maps_cache: Optional[ClientMaps] = None
+
+
+def load_client_maps() -> ClientMaps:
+    """Forward (no -> name) and reverse (name -> no) client maps, cached.
+
+    The reverse map is rebuilt only when load_clients() hands back a fresh
+    dict, i.e. when the underlying file changed.
+    """
+    global _client_maps_cache
+    by_no = load_clients()
+    if _client_maps_cache is None or _client_maps_cache.by_no is not by_no:
+        _client_maps_cache = ClientMaps(by_no, {v: k for k, v in by_no.items()})
+    return _client_maps_cache
+
+
 def _ensure_history_has_party_column() -> None:
-    if not HISTORY_CSV.exists():
+    global _party_column_ok
+    if _party_column_ok or not HISTORY_CSV.exists():
         return
+    # Peek at just the header line first; only read the whole file when the
+    # column is actually missing and a rewrite is needed.
     with HISTORY_CSV.open("r", newline="", encoding="utf-8") as f:
+        first_line = f.readline()
+        if "party_name" in first_line:
+            _party_column_ok = True
+            return
+        f.seek(0)
         reader = csv.reader(f)
         try:
             header = next(reader)
         except StopIteration:
             header = []
-        if "party_name" in header:
-            return
         rows = list(reader)
     header.append("party_name")
     with HISTORY_CSV.open("w", newline="", encoding="utf-8") as f:
@@ -114,75 +191,159 @@ def _ensure_history_has_party_column() -> None:
         for row in rows:
             row.append("")
             writer.writerow(row)
+    _party_column_ok = True
+
+
+def _format_history_row(result: CalculationResult, party_name: str = "") -> str:
+    # Same shape as datetime.utcnow().isoformat(timespec="seconds") without
+    # constructing a datetime (and without the 3.12 utcnow deprecation)
+    t = time.gmtime()
+    created_at = (
+        f"{t.tm_year}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+    )
+
+    return _HISTORY_ROW_FMT.format(
+        date=format_date_for_csv(result.date),
+        v_no=str(result.invoice_no).replace('"', '""'),
+        client_no=result.client_no,
+        client_name=(result.client_name or "").replace('"', '""'),
+        total_nuts=result.total_nuts,
+        waste=result.waste_nuts,
+        remaining=result.remaining_nuts,
+        price_each=f"{result.price_each_rupees:.2f}",
+        gross=f"{result.gross_amount:.2f}",
+        tax=f"{result.tax_amount:.2f}",
+        labor=f"{result.labor_charges:.2f}",
+        final_amount=f"{result.final_amount:.2f}",
+        created_at=created_at,
+        party_name=(party_name or "").replace('"', '""'),
+    )
+
+
+class HistoryWriter:
+    """Append many history rows through one open, buffered file handle.
+
+    Bulk callers open this once and write per slip, amortizing the
+    open/close per row; append_history() is the single-shot wrapper.
+    """
+
+    def __init__(self) -> None:
+        self._f = None
+
+    def __enter__(self) -> "HistoryWriter":
+        ensure_files_exist()
+        _ensure_history_has_party_column()
+        self._f = HISTORY_CSV.open("a", newline="", encoding="utf-8", buffering=64 * 1024)
+        if self._f.tell() == 0:
+            self._f.write(",".join(HISTORY_FIELDS) + "\n")
+        return self
+
+    def write(self, result: CalculationResult, party_name: str = "") -> None:
+        self._f.write(_format_history_row(result, party_name))
+
+    def write_line(self, line: str) -> None:
+        """Write an already-formatted CSV row (used by the flush path)."""
+        self._f.write(line)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._f.flush()
+        self._f.close()
+        self._f = None
+
+
+# Deduplication used to run on every web request (a full-file rewrite per
+# page load). It now runs opportunistically once every _DEDUP_EVERY appends.
+_DEDUP_EVERY = 50
+_appends_since_dedup = 0
+_append_count_lock = threading.Lock()
+
+
+def _count_append_and_maybe_dedup() -> None:
+    global _appends_since_dedup
+    with _append_count_lock:
+        _appends_since_dedup += 1
+        due = _appends_since_dedup >= _DEDUP_EVERY
+        if due:
+            _appends_since_dedup = 0
+    if due:
+        deduplicate_history()
+
+
+# Appends are queued in memory and written in one batch - one file open and
+# flush per _FLUSH_EVERY rows instead of per request. Every read path calls
+# flush_history() first, so callers never observe a stale file, and an atexit
+# hook drains the queue on interpreter shutdown.
+_FLUSH_EVERY = 25
+_pending_rows: List[str] = []
+_pending_lock = threading.Lock()
+
+
+def flush_history() -> None:
+    """Write any queued history rows to disk (no-op when the queue is empty)."""
+    global _pending_rows
+    with _pending_lock:
+        if not _pending_rows:
+            return
+        rows, _pending_rows = _pending_rows, []
+    with HistoryWriter() as w:
+        for line in rows:
+            w.write_line(line)
+
+
+atexit.register(flush_history)
 
 
 def append_history(result: CalculationResult, party_name: str = "") -> None:
-    """Append a calculation result to history.csv with optional party_name."""
-    ensure_files_exist()
-    _ensure_history_has_party_column()
-
-    fieldnames = [
-        "date",
-        "v_no",
-        "client_no",
-        "client_name",
-        "total_nuts",
-        "waste",
-        "remaining",
-        "price_each",
-        "gross",
-        "tax",
-        "labor",
-        "final_amount",
-        "created_at",
-        "party_name",
-    ]
-
-    row = {
-        "date": format_date_for_csv(result.date),
-        "v_no": result.invoice_no,
-        "client_no": result.client_no,
-        "client_name": result.client_name,
-        "total_nuts": result.total_nuts,
-        "waste": result.waste_nuts,
-        "remaining": result.remaining_nuts,
-        "price_each": f"{result.price_each_rupees:.2f}",
-        "gross": f"{result.gross_amount:.2f}",
-        "tax": f"{result.tax_amount:.2f}",
-        "labor": f"{result.labor_charges:.2f}",
-        "final_amount": f"{result.final_amount:.2f}",
-        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
-        "party_name": party_name or "",
-    }
-
-    with HISTORY_CSV.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        if f.tell() == 0:
-            writer.writeheader()
-        writer.writerow(row)
+    """Queue a calculation result for history.csv with optional party_name.
 
+    The row is formatted immediately (so created_at reflects append time) but
+    hits disk in batches; see flush_history().
+    """
+    line = _format_history_row(result, party_name)
+    with _pending_lock:
+        _pending_rows.append(line)
+        due = len(_pending_rows) >= _FLUSH_EVERY
+    if due:
+        flush_history()
+    _count_append_and_maybe_dedup()
 
-def load_parties() -> List[str]:
-    """Load list of party names from parties.csv (unique, non-empty)."""
+
+# In-memory parties cache: loaded from parties.csv once per process and kept
+# in sync on append, so lookups don't re-read the file.
+_parties_order: Optional[List[str]] = None
+_parties_seen: Optional[set] = None
+
+
+def _load_parties_cache() -> None:
+    global _parties_order, _parties_seen
+    if _parties_order is not None:
+        return
     ensure_files_exist()
-    parties: List[str] = []
+    order: List[str] = []
+    seen: set = set()
     if PARTIES_CSV.exists():
+        # Single positional pass; the file is one party_name column
         with PARTIES_CSV.open("r", newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            next(reader, None)  # header
             for row in reader:
-                name = (row.get("party_name") or "").strip()
-                if name:
-                    parties.append(name)
-    # de-duplicate while preserving order
-    seen = set()
-    unique: List[str] = []
-    for p in parties:
-        k = p.lower()
-        if k in seen:
-            continue
-        seen.add(k)
-        unique.append(p)
-    return unique
+                name = row[0].strip() if row else ""
+                if not name:
+                    continue
+                k = name.lower()
+                if k in seen:
+                    continue
+                seen.add(k)
+                order.append(name)
+    _parties_order = order
+    _parties_seen = seen
+
+
+def load_parties() -> List[str]:
+    """Load list of party names from parties.csv (unique, non-empty)."""
+    _load_parties_cache()
+    return list(_parties_order)
 
 
 def append_party_if_new(name: str) -> None:
@@ -190,17 +351,20 @@ def append_party_if_new(name: str) -> None:
     name = (name or "").strip()
     if not name:
         return
-    ensure_files_exist()
-    existing = set(p.lower() for p in load_parties())
-    if name.lower() in existing:
+    _load_parties_cache()
+    key = name.lower()
+    if key in _parties_seen:
         return
     with PARTIES_CSV.open("a", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=["party_name"], extrasaction="ignore")
         if f.tell() == 0:
             writer.writeheader()
         writer.writerow({"party_name": name})
+    _parties_seen.add(key)
+    _parties_order.append(name)
 
 
+@lru_cache(maxsize=1024)
 def _shorten_client_name(name: str) -> str:
     parts = [p for p in name.split() if p]
     if not parts:
@@ -211,10 +375,15 @@ def _shorten_client_name(name: str) -> str:
     return (parts[0] + parts[-1])[:24]
 
 
+@lru_cache(maxsize=1024)
+def _slip_filename_cached(invoice_no: str, ymd: str, short: str) -> str:
+    return f"VNo{invoice_no}_{ymd}_{short}.txt"
+
+
 def slip_filename(result: CalculationResult) -> str:
     ymd = result.date.strftime("%Y%m%d")
     short = _shorten_client_name(result.client_name).replace(" ", "")
-    return f"VNo{result.invoice_no}_{ymd}_{short}.txt"
+    return _slip_filename_cached(result.invoice_no, ymd, short)
 
 
 def save_slip_text(result: CalculationResult, content: str) -> Path:
@@ -238,11 +407,41 @@ def save_slip_text_if_new(result: CalculationResult, content: str) -> Tuple[Path
     return path, True
 
 
+class _SanitizeTable(dict):
+    """Translate table mapping disallowed characters to '_'.
+
+    ASCII is precomputed; non-ASCII ordinals are classified lazily on first
+    sight (alphanumerics pass through, everything else becomes '_') and
+    memoized for subsequent translations.
+    """
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        out = ch if ch.isalnum() else "_"
+        self[code] = out
+        return out
+
+
+_SANITIZE_TABLE = _SanitizeTable(
+    {i: (chr(i) if chr(i).isalnum() or chr(i) in "-_" else "_") for i in range(128)}
+)
+# 256-entry table for the bytes fast path: one C-level pass over the buffer
+_SAFE_BYTES_TABLE = bytes(
+    (b if (chr(b).isalnum() or chr(b) in "-_") else ord("_")) for b in range(256)
+)
+_UNDERSCORE_RE = re.compile(r"_{2,}")
+
+
 def _sanitize_filename_component(text: str) -> str:
-    safe = "".join(ch if ch.isalnum() or ch in ("-", "_") else "_" for ch in (text or "").strip())
+    raw = (text or "").strip()
+    if raw.isascii():
+        # Common case: bytes.translate is a single C scan over the buffer
+        safe = raw.encode("ascii").translate(_SAFE_BYTES_TABLE).decode("ascii")
+    else:
+        # Non-ASCII names keep their alphanumerics via the lazy str table
+        safe = raw.translate(_SANITIZE_TABLE)
     # collapse multiple underscores
-    while "__" in safe:
-        safe = safe.replace("__", "_")
+    safe = _UNDERSCORE_RE.sub("_", safe)
     return safe.strip("._") or "NA"
 
 
@@ -281,11 +480,18 @@ def save_range_report(party_name: str, from_vno: int, to_vno: int, report_text:
 
 def read_history_rows() -> List[Dict[str, str]]:
     ensure_files_exist()
+    flush_history()
     if not HISTORY_CSV.exists():
         return []
     with HISTORY_CSV.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return list(reader)
+        reader = csv.reader(f)
+        try:
+            header = next(reader)
+        except StopIteration:
+            return []
+        # Parse positionally and build dicts only at the API boundary;
+        # csv.reader skips DictReader's per-row fieldname bookkeeping.
+        return [dict(zip(header, row)) for row in reader]
 
 
 def deduplicate_history() -> int:
@@ -296,39 +502,53 @@ def deduplicate_history() -> int:
     occurrence and discards subsequent ones. Returns the number of removed rows.
     """
     ensure_files_exist()
+    flush_history()
     if not HISTORY_CSV.exists():
         return 0
-    with HISTORY_CSV.open("r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        header = reader.fieldnames or []
-    if not rows:
-        return 0
 
-    # Ensure party_name column exists in header
-    if "party_name" not in header:
-        header.append("party_name")
-        for r in rows:
-            r.setdefault("party_name", "")
-
-    seen_keys = set()
-    unique_rows: List[Dict[str, str]] = []
     removed = 0
-    for r in rows:
-        name = (r.get("client_name") or r.get("Name") or "").strip().lower()
-        vno = str(r.get("v_no") or r.get("V.No.") or "").strip()
-        amt = str(r.get("final_amount") or r.get("Amount") or "").strip()
-        key = (name, vno, amt)
-        if key in seen_keys:
-            removed += 1
-            continue
-        seen_keys.add(key)
-        unique_rows.append(r)
-
-    with HISTORY_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
-        writer.writeheader()
-        for r in unique_rows:
-            writer.writerow(r)
+    seen_keys = set()
+    with HISTORY_CSV.open("r", newline="", encoding="utf-8") as src:
+        reader = csv.reader(src)
+        try:
+            header = next(reader)
+        except StopIteration:
+            return 0
+
+        # Ensure party_name column exists in header
+        if "party_name" not in header:
+            header.append("party_name")
+
+        # Resolve key columns once (with legacy header fallbacks)
+        idx = {name: i for i, name in enumerate(header)}
+        name_i = idx.get("client_name", idx.get("Name"))
+        vno_i = idx.get("v_no", idx.get("V.No."))
+        amt_i = idx.get("final_amount", idx.get("Amount"))
+
+        def field(row: List[str], i: Optional[int]) -> str:
+            return row[i].strip() if i is not None and i < len(row) else ""
+
+        # Stream unique rows into a temp file in the same directory, then
+        # atomically swap it in; avoids materializing the whole file.
+        tmp = tempfile.NamedTemporaryFile(
+            "w", dir=DATA_DIR, delete=False, newline="", encoding="utf-8", suffix=".tmp"
+        )
+        try:
+            with tmp:
+                writer = csv.writer(tmp)
+                writer.writerow(header)
+                for row in reader:
+                    key = (field(row, name_i).lower(), field(row, vno_i), field(row, amt_i))
+                    if key in seen_keys:
+                        removed += 1
+                        continue
+                    seen_keys.add(key)
+                    if len(row) < len(header):
+                        row = row + [""] * (len(header) - len(row))
+                    writer.writerow(row)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, HISTORY_CSV)
     return removed
 
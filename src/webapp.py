@@ -1,32 +1,41 @@
 from __future__ import annotations
 
 from datetime import date as Date, datetime
-from decimal import Decimal, InvalidOperation
-from typing import Dict, Optional
-import json
-import time
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, List, Optional
+import bisect
+import os
+import sys
 
 from flask import (
     Flask,
+    abort,
+    make_response,
     render_template,
     request,
     redirect,
     url_for,
     send_from_directory,
 )
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.security import safe_join
 
 from .core import CalculationInput, calculate
 from .cli import render_slip, APP_TITLE
 from .persistence import (
     ensure_files_exist,
     load_clients,
+    load_client_maps,
     append_history,
+    flush_history,
     save_slip_text,
     save_slip_text_if_new,
+    HISTORY_CSV,
     SLIPS_DIR,
     read_history_rows,
     load_parties,
-    deduplicate_history,
     save_range_report,
     save_range_report_if_new,
 )
@@ -35,26 +44,252 @@ from pathlib import Path
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = "dev-key-change-later"
-app.config["TEMPLATES_AUTO_RELOAD"] = True
-app.jinja_env.auto_reload = True
+# Only re-stat templates per render when running the debug server; in
+# production the compiled template stays cached for the process lifetime.
+app.config["TEMPLATES_AUTO_RELOAD"] = app.debug
+
+# Persist compiled templates to disk so warm process starts skip the
+# Jinja source -> Python bytecode compile entirely. With no JINJA_CACHE_DIR
+# set, Jinja picks its own per-user 0700 cache directory; loading marshalled
+# code from a shared world-writable path would let another local user plant
+# code, so no fallback directory is hardcoded here.
+_JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR")
+if _JINJA_CACHE_DIR:
+    os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(
+    directory=_JINJA_CACHE_DIR, pattern="__jinja2_%s.cache"
+)
+
+# The logo is shipped with the app, so resolve it once at import instead of
+# stat'ing the static directory on every request
+_STATIC_DIR = Path(__file__).resolve().parent / "static"
+if (_STATIC_DIR / "logo.png").exists():
+    _LOGO_FILE: Optional[str] = "logo.png"
+elif (_STATIC_DIR / "logo.svg").exists():
+    _LOGO_FILE = "logo.svg"
+else:
+    _LOGO_FILE = None
+
+
+# The static URL rule never changes at runtime, so the logo URL is built by
+# url_for once (on the first request) and reused; later renders skip the
+# URL-map walk and parameter encoding entirely.
+_LOGO_URL: Optional[str] = None
+
+
+def _logo_context():
+    """Return the (has_logo, logo_url) pair used by every render path."""
+    global _LOGO_URL
+    if _LOGO_FILE and _LOGO_URL is None:
+        _LOGO_URL = url_for("static", filename=_LOGO_FILE)
+    return bool(_LOGO_FILE), _LOGO_URL
+
+
+# JSON serialization for the API endpoints: orjson (Rust, emits bytes
+# directly) when available, otherwise compact stdlib json. The app's only
+# hard dependencies stay Flask/waitress.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_response(obj, status: int = 200):
+    """Serialize obj with _dumps, skipping jsonify's indirection."""
+    return app.response_class(_dumps(obj), status=status, mimetype="application/json")
+
+
+_NO_CACHE_HEADERS = {
+    "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
 
 
 @app.after_request
 def _disable_html_cache(response):
+    # mimetype is the already-parsed, lowercased content type, so this runs
+    # without string munging on every response - and JSON/static responses
+    # (where no-store would hurt caching) are skipped entirely
+    if response.mimetype == "text/html":
+        response.headers.update(_NO_CACHE_HEADERS)
+    return response
+
+
+def _to_int(value, default: Optional[int] = None) -> Optional[int]:
+    """Parse an integer without raising; blank or malformed input yields default."""
+    s = str(value or "").strip()
+    if not s:
+        return default
+    body = s[1:] if s[0] == "-" else s
+    return int(s) if body.isdigit() else default
+
+
+# Cached history rows are plain tuples, not dicts: one Row class instead of
+# per-row dicts with repeated keys (a fraction of the memory for large
+# files), attribute access in the scan loops, and the legacy header
+# fallbacks ("V.No."/"Name"/...) resolved once at build instead of per read.
+Row = namedtuple("Row", "v_no client_no client_name total_nuts price_each final_amount date")
+
+# Parsed history rows, cached until the CSV changes on disk. Alongside the
+# raw rows we keep a voucher-number-sorted view with the report label and
+# amount text of every row prerendered, so a range request only slices and
+# aligns - all per-row parsing/formatting happens once per file change.
+# Rebuilds construct a fresh dict and publish it with one reference swap, so
+# waitress worker threads never see a generation mixed mid-rebuild; readers
+# take one snapshot of the global and index only into that.
+_HISTORY_CACHE: Dict[str, object] = {
+    "key": None,
+    "rows": [],
+    "sorted_vnos": [],
+    "sorted_labels": [],
+    "sorted_amounts": [],
+    "by_vno_last": {},
+}
+
+
+def _report_amount_text(amount: str) -> str:
+    # Exact integer paise via Decimal; float would reintroduce binary
+    # rounding on currency values. Runs only at cache build, once per row.
+    try:
+        paise_total = int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError, ValueError):
+        paise_total = 0
+    rupees, paise = divmod(paise_total, 100)
+    amt_text = _format_indian_number(rupees)
+    if paise:
+        amt_text += f".{paise:02d}"
+    return amt_text
+
+
+def _history_cache() -> Dict[str, object]:
+    global _HISTORY_CACHE
+    cache = _HISTORY_CACHE
+    # Queued appends only reach the file on flush; drain them first so the
+    # stat key below moves and this read path never misses pending rows
+    flush_history()
+    try:
+        st = HISTORY_CSV.stat()
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    if key != cache["key"]:
+        rows: List[Row] = []
+        pairs = []
+        by_vno_last: Dict[int, Row] = {}
+        for r in read_history_rows():
+            row = Row(
+                v_no=(r.get("v_no") or r.get("V.No.") or "").strip(),
+                client_no=(r.get("client_no") or "").strip(),
+                # Client names repeat heavily across rows; intern them so
+                # every occurrence shares one string object
+                client_name=sys.intern((r.get("client_name") or r.get("Name") or "").strip()),
+                total_nuts=(r.get("total_nuts") or r.get("Total") or "").strip(),
+                price_each=(r.get("price_each") or r.get("Price") or "").strip(),
+                final_amount=(r.get("final_amount") or r.get("Amount") or "").strip(),
+                date=(r.get("date") or r.get("Date") or "").strip(),
+            )
+            rows.append(row)
+            v_int = _to_int(row.v_no)
+            if v_int is None:
+                continue  # non-numeric voucher numbers can't be range-queried
+            pairs.append((v_int, row))
+            by_vno_last[v_int] = row  # in file order, so the latest row wins
+        pairs.sort(key=lambda t: t[0])
+        labels = []
+        amounts = []
+        for v_int, row in pairs:
+            labels.append(f"{row.client_name} ({v_int})")
+            amounts.append(_report_amount_text(row.final_amount or "0"))
+        cache = {
+            "key": key,
+            "rows": rows,
+            "sorted_vnos": [v for v, _ in pairs],
+            "sorted_labels": labels,
+            "sorted_amounts": amounts,
+            "by_vno_last": by_vno_last,
+        }
+        _HISTORY_CACHE = cache  # one atomic reference swap
+    return cache
+
+
+def _cached_history_rows():
+    return _history_cache()["rows"]
+
+
+@lru_cache(maxsize=256)
+def _voucher_payload_cached(v_no_int: int, cache_key) -> Optional[dict]:
+    """Build the /voucher_get response data, memoized per history-file state.
+
+    Re-running calculate + render_slip for the same voucher is pure
+    recomputation - the row can only change when the CSV does, so the key
+    includes the history cache key and stale entries are never served.
+    History keeps its schema; the slip text is rebuilt once and reused.
+    """
+    found = _history_cache()["by_vno_last"].get(v_no_int)
+    if not found:
+        return None
+
+    # Fields were normalized (legacy headers, whitespace) at cache build
+    client_name = found.client_name
+    client_no = _to_int(found.client_no, default=0)
+    total_nuts = _to_int(found.total_nuts, default=0)
+    try:
+        price_each = Decimal(found.price_each or "0")
+    except (InvalidOperation, ValueError):
+        price_each = Decimal("0")
     try:
-        ct = (response.headers.get("Content-Type") or "").lower()
-        if ct.startswith("text/html"):
-            response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
+        on_date = parse_date(found.date)
     except Exception:
-        pass
-    return response
+        on_date = Date.today()
+
+    # Recompute and render slip text
+    try:
+        input_data = CalculationInput(
+            invoice_no=str(v_no_int),
+            client_no=client_no,
+            client_name=client_name,
+            total_nuts=total_nuts,
+            price_each_rupees=price_each,
+            date=on_date,
+        )
+        result = calculate(input_data)
+        slip_text = render_slip(APP_TITLE, result)
+    except Exception:
+        slip_text = None
+
+    return {
+        "v_no": str(v_no_int),
+        "client_no": client_no,
+        "client_name": client_name,
+        "total_nuts": total_nuts,
+        "price_each": float(price_each) if price_each is not None else 0.0,
+        "date": on_date.strftime("%Y-%m-%d"),
+        "slip_text": slip_text,
+    }
 
 
 def parse_date(value: Optional[str]) -> Date:
     if not value:
         return Date.today()
+    # The date form field submits ISO YYYY-MM-DD, so handle it (and the
+    # manual DD-MM-YYYY / DD/MM/YYYY variants) by slicing digits directly;
+    # strptime only runs for the rare remaining forms.
+    if len(value) == 10:
+        try:
+            if value[4] == "-" and value[7] == "-":
+                return Date(int(value[:4]), int(value[5:7]), int(value[8:10]))
+            if value[2] in "-/" and value[5] in "-/":
+                return Date(int(value[6:10]), int(value[3:5]), int(value[:2]))
+        except ValueError:
+            pass
     for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d-%b-%Y", "%d/%m/%Y"):
         try:
             return datetime.strptime(value, fmt).date()
@@ -68,34 +303,82 @@ def get_clients() -> Dict[int, str]:
     return load_clients()
 
 
+def _parse_slip_request(data) -> tuple[Optional[CalculationInput], Optional[str]]:
+    """Validate one slip's worth of fields from a form or JSON mapping.
+
+    Shared by /generate and /slip-save, which previously duplicated the whole
+    validation chain. Returns (input, None) on success or (None, message) for
+    the first failing field.
+    """
+    v_no = str(data.get("v_no") or "").strip()
+    if not v_no:
+        return None, "V.No. cannot be empty"
+
+    # Accept manual name entry; if it matches a known client, use its number,
+    # else number 0
+    typed_name = str(data.get("client_name") or "").strip()
+    if typed_name:
+        client_no = load_client_maps().by_name.get(typed_name, 0)
+        client_name = typed_name
+    else:
+        clients = get_clients()
+        client_no = _to_int(str(data.get("client_no") or "0").strip() or "0")
+        if client_no is None:
+            return None, "Client No. must be an integer"
+        if client_no not in clients:
+            return None, "Client No. not found in clients list (1–20)"
+        client_name = clients[client_no]
+
+    total_nuts = _to_int(data.get("total_nuts") or "0")
+    if total_nuts is None:
+        return None, "Total Coconuts must be a positive integer"
+    if total_nuts <= 0:
+        return None, "Total Coconuts must be > 0"
+
+    try:
+        price_each = Decimal(str(data.get("price_each") or "0").strip())
+    except (InvalidOperation, ValueError):
+        return None, "Price Each must be a positive number"
+    if price_each <= 0:
+        return None, "Price Each must be > 0"
+
+    try:
+        slip_date = parse_date(str(data.get("date") or "").strip() or None)
+    except ValueError as e:
+        return None, str(e)
+
+    return (
+        CalculationInput(
+            invoice_no=v_no,
+            client_no=client_no,
+            client_name=client_name,
+            total_nuts=total_nuts,
+            price_each_rupees=price_each,
+            date=slip_date,
+        ),
+        None,
+    )
+
+
 def _format_indian_number(n: int) -> str:
     """Format integer using Indian numbering system (e.g., 1545468 -> 15,45,468)."""
     s = str(abs(int(n)))
     if len(s) <= 3:
-        out = s
-    else:
-        last3 = s[-3:]
-        rest = s[:-3]
-        groups = []
-        while len(rest) > 2:
-            groups.insert(0, rest[-2:])
-            rest = rest[:-2]
-        if rest:
-            groups.insert(0, rest)
-        out = ",".join(groups + [last3])
-    return out
+        return s
+    head, last3 = s[:-3], s[-3:]
+    # Pad the head to a multiple of 2 so it slices into clean 2-digit groups
+    pad = (-len(head)) % 2
+    head = "0" * pad + head
+    groups = [head[i : i + 2] for i in range(0, len(head), 2)]
+    if pad:
+        groups[0] = groups[0][1:]
+    return ",".join(groups) + "," + last3
 
 
 @app.route("/")
 def index():
     clients = get_clients()
-    static_dir = Path(__file__).resolve().parent / "static"
-    logo_file = None
-    if (static_dir / "logo.png").exists():
-        logo_file = "logo.png"
-    elif (static_dir / "logo.svg").exists():
-        logo_file = "logo.svg"
-    removed = deduplicate_history()  # Optional cleanup on landing
+    has_logo, logo_url = _logo_context()
     return render_template(
         "index.html",
         title=APP_TITLE,
@@ -106,8 +389,8 @@ def index():
         message=None,
         error=None,
         saved_filename=None,
-        has_logo=bool(logo_file),
-        logo_url=(url_for("static", filename=logo_file) if logo_file else None),
+        has_logo=has_logo,
+        logo_url=logo_url,
         report_text=None,
     )
 
@@ -115,17 +398,12 @@ def index():
 @app.route("/dashboard")
 def dashboard():
     """Simple dashboard with two primary actions: Pay Slip and Voucher Range."""
-    static_dir = Path(__file__).resolve().parent / "static"
-    logo_file = None
-    if (static_dir / "logo.png").exists():
-        logo_file = "logo.png"
-    elif (static_dir / "logo.svg").exists():
-        logo_file = "logo.svg"
+    has_logo, logo_url = _logo_context()
     return render_template(
         "dashboard.html",
         title=APP_TITLE,
-        has_logo=bool(logo_file),
-        logo_url=(url_for("static", filename=logo_file) if logo_file else None),
+        has_logo=has_logo,
+        logo_url=logo_url,
     )
 
 
@@ -134,14 +412,7 @@ def generate():
     clients = get_clients()
 
     def render_with(error: Optional[str] = None, slip_text: Optional[str] = None, filename: Optional[str] = None):
-        static_dir = Path(__file__).resolve().parent / "static"
-        logo_file = None
-        if (static_dir / "logo.png").exists():
-            logo_file = "logo.png"
-        elif (static_dir / "logo.svg").exists():
-            logo_file = "logo.svg"
-        # After save, optionally de-duplicate silently
-        removed = deduplicate_history()
+        has_logo, logo_url = _logo_context()
         return render_template(
             "index.html",
             title=APP_TITLE,
@@ -152,8 +423,8 @@ def generate():
             error=error,
             message=(None if error else ("Slip saved" if filename else None)),
             saved_filename=filename,
-            has_logo=bool(logo_file),
-            logo_url=(url_for("static", filename=logo_file) if logo_file else None),
+            has_logo=has_logo,
+            logo_url=logo_url,
             report_text=None,
             form={
                 "v_no": request.form.get("v_no", ""),
@@ -167,53 +438,10 @@ def generate():
         )
 
     try:
-        start_ts = time.perf_counter()
-        v_no = (request.form.get("v_no") or "").strip()
-        if not v_no:
-            return render_with(error="V.No. cannot be empty")
-
-        # Accept manual name entry; if matches known client, use its number, else number 0
-        typed_name = (request.form.get("client_name") or "").strip()
-        if typed_name:
-            name_to_no = {v: k for k, v in clients.items()}
-            client_no = name_to_no.get(typed_name, 0)
-            client_name = typed_name
-        else:
-            try:
-                client_no = int(request.form.get("client_no") or 0)
-            except Exception:
-                return render_with(error="Client No. must be an integer")
-            if client_no not in clients:
-                return render_with(error="Client No. not found in clients list (1–20)")
-            client_name = clients[client_no]
+        input_data, err = _parse_slip_request(request.form)
+        if err:
+            return render_with(error=err)
 
-        try:
-            total_nuts = int(request.form.get("total_nuts") or 0)
-        except Exception:
-            return render_with(error="Total Coconuts must be a positive integer")
-        if total_nuts <= 0:
-            return render_with(error="Total Coconuts must be > 0")
-
-        try:
-            price_each = Decimal(request.form.get("price_each") or "0")
-        except (InvalidOperation, ValueError):
-            return render_with(error="Price Each must be a positive number")
-        if price_each <= 0:
-            return render_with(error="Price Each must be > 0")
-
-        try:
-            slip_date = parse_date(request.form.get("date"))
-        except Exception as e:
-            return render_with(error=str(e))
-
-        input_data = CalculationInput(
-            invoice_no=v_no,
-            client_no=client_no,
-            client_name=client_name,
-            total_nuts=total_nuts,
-            price_each_rupees=price_each,
-            date=slip_date,
-        )
         result = calculate(input_data)
         slip = render_slip(APP_TITLE, result)
 
@@ -224,11 +452,6 @@ def generate():
         party_name = (request.form.get("party_name") or "").strip()
         append_history(result, party_name=party_name)
 
-        # Ensure user perceives loading for UX consistency (minimum 0.5 second)
-        elapsed = time.perf_counter() - start_ts
-        remaining = 0.5 - elapsed
-        if remaining > 0:
-            time.sleep(remaining)
         return render_with(error=None, slip_text=slip, filename=None)
     except Exception as e:
         return render_with(error=str(e))
@@ -239,12 +462,7 @@ def voucher_range():
     clients = get_clients()
 
     def render_with(error: Optional[str] = None, report_text: Optional[str] = None, saved_range: Optional[str] = None):
-        static_dir = Path(__file__).resolve().parent / "static"
-        logo_file = None
-        if (static_dir / "logo.png").exists():
-            logo_file = "logo.png"
-        elif (static_dir / "logo.svg").exists():
-            logo_file = "logo.svg"
+        has_logo, logo_url = _logo_context()
         return render_template(
             "index.html",
             title=APP_TITLE,
@@ -255,8 +473,8 @@ def voucher_range():
             error=error,
             message=(None if error else ("Report saved" if saved_range else ("Report ready" if report_text else None))),
             saved_filename=None,
-            has_logo=bool(logo_file),
-            logo_url=(url_for("static", filename=logo_file) if logo_file else None),
+            has_logo=has_logo,
+            logo_url=logo_url,
             report_text=report_text,
             form={
                 "v_no": request.form.get("v_no", ""),
@@ -276,58 +494,36 @@ def voucher_range():
         to_no = request.form.get("range_to")
         if not from_no or not to_no:
             return render_with(error="Please enter both From and To voucher numbers")
-        try:
-            a = int(from_no)
-            b = int(to_no)
-        except Exception:
+        a = _to_int(from_no)
+        b = _to_int(to_no)
+        if a is None or b is None:
             return render_with(error="Voucher numbers must be integers")
         if a > b:
             a, b = b, a
 
-        rows = read_history_rows()
-        filtered = []
-        for r in rows:
-            v = r.get("v_no") or r.get("V.No.") or ""
-            try:
-                v_int = int(str(v).strip())
-            except Exception:
-                continue
-            if a <= v_int <= b:
-                filtered.append((v_int, r))
-        filtered.sort(key=lambda t: t[0])
-
-        if not filtered:
-            return render_with(report_text="No vouchers found in this range")
+        cache = _history_cache()
+        vnos = cache["sorted_vnos"]
+        lo = bisect.bisect_left(vnos, a)
+        hi = bisect.bisect_right(vnos, b)
 
-        # Build aligned report: index. Name (V.No.)  =  amount (columns aligned)
-        entries = []
-        for vnum, r in filtered:
-            name = (r.get("client_name") or r.get("Name") or "").strip()
-            amount = r.get("final_amount") or r.get("Amount") or "0"
-            try:
-                amt = float(amount)
-            except Exception:
-                amt = 0.0
-            rupees = int(amt)
-            paise = int(round((amt - rupees) * 100))
-            amt_text = f"{_format_indian_number(rupees)}"
-            if paise:
-                amt_text += f".{paise:02d}"
-            label = f"{name} ({vnum})"
-            entries.append((label, amt_text))
-
-        if not entries:
-            return render_with(report_text="No vouchers found in this range")
+        # Labels and amount text are prerendered at cache build; the request
+        # only slices the window and aligns the columns
+        labels = cache["sorted_labels"][lo:hi]
+        amounts = cache["sorted_amounts"][lo:hi]
 
-        name_width = max(len(lbl) for lbl, _ in entries)
-        amt_width = max(len(amt) for _, amt in entries)
-        idx_width = len(str(len(entries)))
-        lines = []
-        for i, (lbl, amt) in enumerate(entries, start=1):
-            lines.append(f"{str(i).rjust(idx_width)}. {lbl.ljust(name_width)}  =  {amt.rjust(amt_width)}")
+        if not labels:
+            return render_with(report_text="No vouchers found in this range")
 
-        # Optional: de-duplicate before showing report
-        deduplicate_history()
+        # Width passes use map(len, ...) (all C-level), and the line build is
+        # a single comprehension with alignment done by the format specs
+        # themselves - no per-row str()/ljust/rjust calls or list appends.
+        name_width = max(map(len, labels))
+        amt_width = max(map(len, amounts))
+        idx_width = len(str(len(labels)))
+        lines = [
+            f"{i:>{idx_width}}. {lbl:<{name_width}}  =  {amt:>{amt_width}}"
+            for i, (lbl, amt) in enumerate(zip(labels, amounts), start=1)
+        ]
         report_text = "\n".join(lines)
         # Do not auto-save here; saving is done only via Save Range button
         return render_with(report_text=report_text)
@@ -335,68 +531,57 @@ def voucher_range():
         return render_with(error=str(e))
 
 
+# With USE_XSENDFILE=1 the handler emits only headers and the fronting
+# server streams the file; nginx needs an internal location for it:
+#
+#     location /_protected_slips/ {
+#         internal;
+#         alias <SLIPS_DIR>/;
+#     }
+_USE_XSENDFILE = os.environ.get("USE_XSENDFILE", "").strip().lower() in ("1", "true", "yes")
+
+
 @app.route("/slips/<path:filename>")
 def download_slip(filename: str):
-    return send_from_directory(SLIPS_DIR, filename, as_attachment=True)
+    if _USE_XSENDFILE:
+        # Reject traversal before emitting the header, matching the 404 that
+        # send_from_directory gives; nginx normalization is not relied on
+        if safe_join(str(SLIPS_DIR), filename) is None:
+            abort(404)
+        resp = make_response("")
+        resp.headers["X-Accel-Redirect"] = f"/_protected_slips/{filename}"
+        resp.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return resp
+    # conditional=True lets repeat downloads answer If-None-Match /
+    # If-Modified-Since with a bodyless 304 instead of re-reading the file
+    return send_from_directory(
+        SLIPS_DIR,
+        filename,
+        as_attachment=True,
+        conditional=True,
+        etag=True,
+        max_age=3600,
+    )
 
 
 @app.route("/slip-save", methods=["POST"])
 def slip_save():
     try:
         payload = request.get_json(silent=True) or {}
-        v_no = (payload.get("v_no") or "").strip()
-        if not v_no:
-            return (json.dumps({"ok": False, "message": "V.No. is required"}), 400, {"Content-Type": "application/json"})
+        input_data, err = _parse_slip_request(payload)
+        if err:
+            return _json_response({"ok": False, "message": err}, 400)
 
-        # Accept manual name entry; if matches known client, use its number, else number 0
-        clients = get_clients()
-        typed_name = (payload.get("client_name") or "").strip()
-        client_no = 0
-        client_name = typed_name
-        if not typed_name:
-            try:
-                client_no = int(str(payload.get("client_no") or "0").strip())
-            except Exception:
-                client_no = 0
-            if client_no not in clients:
-                return (json.dumps({"ok": False, "message": "Client No. not found in clients list (1–20)"}), 400, {"Content-Type": "application/json"})
-            client_name = clients[client_no]
-
-        try:
-            total_nuts = int(str(payload.get("total_nuts") or "0").strip())
-        except Exception:
-            return (json.dumps({"ok": False, "message": "Total Coconuts must be a positive integer"}), 400, {"Content-Type": "application/json"})
-        if total_nuts <= 0:
-            return (json.dumps({"ok": False, "message": "Total Coconuts must be > 0"}), 400, {"Content-Type": "application/json"})
-
-        try:
-            price_each = Decimal(str(payload.get("price_each") or "0").strip())
-        except (InvalidOperation, ValueError):
-            return (json.dumps({"ok": False, "message": "Price Each must be a positive number"}), 400, {"Content-Type": "application/json"})
-        if price_each <= 0:
-            return (json.dumps({"ok": False, "message": "Price Each must be > 0"}), 400, {"Content-Type": "application/json"})
-
-        date_str = (payload.get("date") or "").strip()
-        on_date = parse_date(date_str) if date_str else Date.today()
-
-        input_data = CalculationInput(
-            invoice_no=v_no,
-            client_no=client_no,
-            client_name=client_name,
-            total_nuts=total_nuts,
-            price_each_rupees=price_each,
-            date=on_date,
-        )
         result = calculate(input_data)
         slip = render_slip(APP_TITLE, result)
 
         path, created = save_slip_text_if_new(result, slip)
         if created:
-            return (json.dumps({"ok": True, "filename": path.name}), 200, {"Content-Type": "application/json"})
+            return _json_response({"ok": True, "filename": path.name})
         else:
-            return (json.dumps({"ok": False, "message": f"Already saved: {path.name}"}), 200, {"Content-Type": "application/json"})
+            return _json_response({"ok": False, "message": f"Already saved: {path.name}"})
     except Exception as e:
-        return (json.dumps({"ok": False, "message": str(e)}), 400, {"Content-Type": "application/json"})
+        return _json_response({"ok": False, "message": str(e)}, 400)
 
 
 @app.route("/voucher-range-save", methods=["POST"])
@@ -411,11 +596,11 @@ def voucher_range_save():
         on_date = parse_date(date_str) if date_str else Date.today()
         path, created = save_range_report_if_new(party_name, min(from_vno, to_vno), max(from_vno, to_vno), report_text, on_date)
         if created:
-            return (json.dumps({"ok": True, "filename": path.name}), 200, {"Content-Type": "application/json"})
+            return _json_response({"ok": True, "filename": path.name})
         else:
-            return (json.dumps({"ok": False, "message": f"Already saved: {path.name}"}), 200, {"Content-Type": "application/json"})
+            return _json_response({"ok": False, "message": f"Already saved: {path.name}"})
     except Exception as e:
-        return (json.dumps({"ok": False, "message": str(e)}), 400, {"Content-Type": "application/json"})
+        return _json_response({"ok": False, "message": str(e)}, 400)
 
 
 @app.route("/voucher_get", methods=["GET"])
@@ -423,77 +608,19 @@ def voucher_get():
     try:
         v_no_str = (request.args.get("v_no") or "").strip()
         if not v_no_str:
-            return (json.dumps({"ok": False, "message": "v_no is required"}), 400, {"Content-Type": "application/json"})
-        try:
-            v_no_int = int(v_no_str)
-        except Exception:
-            return (json.dumps({"ok": False, "message": "v_no must be an integer"}), 400, {"Content-Type": "application/json"})
-
-        rows = read_history_rows()
-        found = None
-        # Prefer the most recent match
-        for r in reversed(rows):
-            try:
-                rv = int(str(r.get("v_no") or r.get("V.No.") or "").strip())
-            except Exception:
-                continue
-            if rv == v_no_int:
-                found = r
-                break
-
-        if not found:
-            return (json.dumps({"ok": False, "message": "Voucher not found"}), 404, {"Content-Type": "application/json"})
-
-        # Extract fields with fallbacks
-        client_name = (found.get("client_name") or found.get("Name") or "").strip()
-        try:
-            client_no = int(str(found.get("client_no") or "0").strip() or 0)
-        except Exception:
-            client_no = 0
-        try:
-            total_nuts = int(str(found.get("total_nuts") or found.get("Total") or "0").strip() or 0)
-        except Exception:
-            total_nuts = 0
-        price_each_str = str(found.get("price_each") or found.get("Price") or "0").strip()
-        try:
-            price_each = Decimal(price_each_str)
-        except (InvalidOperation, ValueError):
-            price_each = Decimal("0")
-        try:
-            on_date = parse_date(str(found.get("date") or found.get("Date") or "").strip())
-        except Exception:
-            on_date = Date.today()
+            return _json_response({"ok": False, "message": "v_no is required"}, 400)
+        v_no_int = _to_int(v_no_str)
+        if v_no_int is None:
+            return _json_response({"ok": False, "message": "v_no must be an integer"}, 400)
 
-        # Recompute and render slip text
-        try:
-            input_data = CalculationInput(
-                invoice_no=str(v_no_int),
-                client_no=client_no,
-                client_name=client_name,
-                total_nuts=total_nuts,
-                price_each_rupees=price_each,
-                date=on_date,
-            )
-            result = calculate(input_data)
-            slip_text = render_slip(APP_TITLE, result)
-        except Exception:
-            slip_text = None
-
-        payload = {
-            "ok": True,
-            "data": {
-                "v_no": str(v_no_int),
-                "client_no": client_no,
-                "client_name": client_name,
-                "total_nuts": total_nuts,
-                "price_each": float(price_each) if price_each is not None else 0.0,
-                "date": on_date.strftime("%Y-%m-%d"),
-                "slip_text": slip_text,
-            },
-        }
-        return (json.dumps(payload), 200, {"Content-Type": "application/json"})
+        cache_key = _history_cache()["key"]
+        data = _voucher_payload_cached(v_no_int, cache_key)
+        if data is None:
+            return _json_response({"ok": False, "message": "Voucher not found"}, 404)
+
+        return _json_response({"ok": True, "data": data})
     except Exception as e:
-        return (json.dumps({"ok": False, "message": str(e)}), 400, {"Content-Type": "application/json"})
+        return _json_response({"ok": False, "message": str(e)}, 400)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from datetime import date as Date
+from decimal import Decimal
+
+from src.cli import APP_TITLE, render_slip
+from src.core import CalculationInput, calculate
+
+
+def test_render_slip_layout():
+    # Pins the 40-column slip layout for the sample case from test_core.
+    input_data = CalculationInput(
+        invoice_no="001",
+        client_no=1,
+        client_name="Client 01",
+        total_nuts=5670,
+        price_each_rupees=Decimal("22"),
+        date=Date(2025, 8, 10),
+        labor_percent=Decimal("11"),
+    )
+
+    slip = render_slip(APP_TITLE, calculate(input_data))
+
+    expected = "\n".join(
+        [
+            "    SRI VIJAYA DURGA COCONUT TRADERS    ",
+            "                            10-Aug-2025",
+            "                                        ",
+            "V.No.: 001",
+            "Name: Client 01",
+            "----------------------------------------",
+            "Total Coconuts:                     5670",
+            "Less (2.2%):                         125",
+            "Remaining Nuts:                     5545",
+            "Price Each:                       ₹22.00",
+            "----------------------------------------",
+            "Gross Amt:                   ₹121,990.00",
+            "Tax (1%):                      ₹1,219.90",
+            "Grader Chg:                      ₹623.70",
+            "----------------------------------------",
+            "Final Pay:                   ₹120,146.40",
+            "----------------------------------------",
+            "",
+            "                               Signature",
+            "                          (S RamaPrasad)",
+        ]
+    )
+    assert slip == expected
+
+
+def test_render_slip_large_amounts_stay_in_40_columns():
+    # Amounts near the field width right-align within the 40-column line
+    # instead of overflowing past it.
+    input_data = CalculationInput(
+        invoice_no="001",
+        client_no=1,
+        client_name="Client 01",
+        total_nuts=99999999,
+        price_each_rupees=Decimal("12345"),
+        date=Date(2025, 8, 10),
+    )
+
+    slip = render_slip(APP_TITLE, calculate(input_data))
+
+    for line in slip.splitlines():
+        assert len(line) <= 40
+    assert "Final Pay:         ₹1,195,256,577,778.56" in slip
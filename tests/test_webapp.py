@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from src import persistence, webapp
+
+
+def test_generate_then_voucher_get_sees_pending_row(tmp_path, monkeypatch):
+    # Appends are queued in memory (persistence._FLUSH_EVERY per batch); a
+    # read through the web cache must still see a just-generated voucher.
+    persistence.flush_history()
+
+    tmp_csv = tmp_path / "history.csv"
+    monkeypatch.setattr(persistence, "HISTORY_CSV", tmp_csv)
+    monkeypatch.setattr(webapp, "HISTORY_CSV", tmp_csv)
+    monkeypatch.setattr(
+        webapp,
+        "_HISTORY_CACHE",
+        {
+            "key": None,
+            "rows": [],
+            "sorted_vnos": [],
+            "sorted_labels": [],
+            "sorted_amounts": [],
+            "by_vno_last": {},
+        },
+    )
+    webapp._voucher_payload_cached.cache_clear()
+
+    client = webapp.app.test_client()
+
+    # Warm the cache so the stat key is current before the append
+    assert client.get("/voucher_get?v_no=4242").status_code == 404
+
+    response = client.post(
+        "/generate",
+        data={
+            "v_no": "4242",
+            "client_no": "1",
+            "total_nuts": "77",
+            "price_each": "10",
+            "date": "2026-08-30",
+        },
+    )
+    assert response.status_code == 200
+
+    payload = client.get("/voucher_get?v_no=4242").get_json()
+    assert payload["ok"]
+    assert payload["data"]["total_nuts"] == 77
+
+    report = client.post(
+        "/voucher-range", data={"range_from": "4242", "range_to": "4242"}
+    )
+    assert b"(4242)" in report.data